@@ -0,0 +1,58 @@
+"""
+src/food_scanner/data/transformers/field_transformers/units.py
+Shared unit tables for weight parsing and product normalization
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+
+# Unit mapping
+UNIT_MAPPING = {
+    # Weight units
+    'g': 'g', 'gr': 'g', 'gram': 'g', 'grams': 'g', 'gramme': 'g', 'grammes': 'g',
+    'kg': 'kg', 'kilo': 'kg', 'kilos': 'kg', 'kilogram': 'kg', 'kilogramme': 'kg',
+    'mg': 'mg',
+
+    # Volume units
+    'l': 'l', 'litre': 'l', 'litres': 'l', 'liter': 'l', 'liters': 'l',
+    'ml': 'ml', 'millilitre': 'ml', 'millilitres': 'ml', 'milliliter': 'ml', 'milliliters': 'ml',
+    'cl': 'cl', 'dl': 'dl',
+
+    # Anglo-Saxon units
+    'oz': 'oz', 'lb': 'lb'
+}
+
+# Conversion factors to grams
+CONVERSION_FACTORS = {
+    'g': 1,
+    'kg': 1000,
+    'mg': 0.001,
+    'oz': 28.35,
+    'lb': 453.59,
+    # Volume approximated as mass (1ml ≈ 1g for liquids)
+    'ml': 1,
+    'cl': 10,
+    'dl': 100,
+    'l': 1000,
+}
+
+# Canonical unit → unit stored in the database (weights are stored in g, volumes in ml)
+STORAGE_UNITS = {
+    'g': 'g',
+    'kg': 'g',
+    'ml': 'ml',
+    'l': 'ml',
+}
+
+
+@lru_cache(maxsize=256)
+def normalize_unit(unit: str) -> Optional[str]:
+    """Map a raw unit string to its canonical unit (memoized, units have low cardinality)"""
+    return UNIT_MAPPING.get(unit.lower().strip())
+
+
+@lru_cache(maxsize=64)
+def storage_unit(unit: str) -> str:
+    """Map a raw unit string to its database unit ('g' or 'ml'), defaulting to grams"""
+    return STORAGE_UNITS.get(normalize_unit(unit), 'g')
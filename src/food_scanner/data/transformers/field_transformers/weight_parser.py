@@ -6,12 +6,36 @@ Correction parsing float/int
 import re
 from typing import Tuple, Optional
 
+from .units import CONVERSION_FACTORS, normalize_unit
+
+
+# Quantity patterns, compiled once and tried in order
+WEIGHT_PATTERNS = [
+    # Multiplication with unit: "2 × 100g", "4 x 25g"
+    (re.compile(r'(\d+(?:\.\d+)?)\s*[×x*]\s*(\d+(?:\.\d+)?)\s*(g|kg|mg|l|ml|cl|dl|oz|lb)\b'),
+    "multiply_with_unit"),
+    
+    # Standard with unit: "400 g", "1.5 kg", "500ml"
+    (re.compile(r'(\d+(?:\.\d+)?)\s*(g|kg|mg|l|ml|cl|dl|oz|lb|gr|grammes?|kilos?|litres?)\b'),
+    "standard_weight_unit"),
+    
+    # Attached unit: "400g", "1.5kg"
+    (re.compile(r'(\d+(?:\.\d+)?)([a-z]+)'),
+    "attached_unit"),
+]
+
+# Simple "<number><unit>" suffixes parsed without regex (longest first)
+SIMPLE_UNIT_SUFFIXES = ('kg', 'ml', 'g')
+
 
 class WeightParser:
     """
     FIXED: Minimal correction of weight parsing for float/int from the API
     """
     
+    # Stateless: all tables live at module level, so instances carry no __dict__
+    __slots__ = ()
+    
     def parse_weight_and_unit(self, quantity_input) -> Tuple[Optional[float], Optional[str]]:
         """
         Main entry point for parsing weight and unit from product quantity data.
@@ -41,8 +65,13 @@ class WeightParser:
         if quantity_input is None:
             return None, None
         
+        # Exact type checks first (plain str/float/int are the only API types), isinstance for subclasses
+        input_type = type(quantity_input)
+        if input_type is str:
+            quantity_str = quantity_input
+        
         # FIX 2: Handle float/int directly (this was the main problem!)
-        if isinstance(quantity_input, (int, float)):
+        elif input_type is float or input_type is int or isinstance(quantity_input, (int, float)):
             # If it's a direct number, assume grams (most common case)
             if 0 < quantity_input < 10000:  # Range raisonnable
                 return float(quantity_input), 'g'
@@ -50,13 +79,44 @@ class WeightParser:
                 return None, None
         
         # FIX 3: Convert to string 
-        if not isinstance(quantity_input, str):
+        elif not isinstance(quantity_input, str):
             quantity_str = str(quantity_input)
         else:
             quantity_str = quantity_input
         
+        # FIX 4: Skip the regex engine for plain quantities ("400", "400g", "1.5kg")
+        simple_result = self._parse_simple_quantity(quantity_str)
+        if simple_result is not None:
+            return simple_result
+        
         return self._parse_weight_and_unit_original_logic(quantity_str)
     
+    def _parse_simple_quantity(self, quantity_str: str) -> Optional[Tuple[Optional[float], Optional[str]]]:
+        """
+        Fast path for the most common quantity strings.
+        
+        Digit-only strings are handled like direct numeric values (grams, same range).
+        "<number><unit>" strings with a g/kg/ml suffix give the same result as the
+        regex patterns. Returns None when the string needs the full parsing logic.
+        """
+        clean_str = quantity_str.strip().lower()
+        
+        if clean_str.isdecimal():
+            value = float(clean_str)
+            return (value, 'g') if 0 < value < 10000 else (None, None)
+        
+        for suffix in SIMPLE_UNIT_SUFFIXES:
+            if clean_str.endswith(suffix):
+                number = clean_str[:-len(suffix)].rstrip()
+                integer_part, dot, decimal_part = number.partition('.')
+                if not integer_part.isdecimal() or (dot and not decimal_part.isdecimal()):
+                    return None
+                
+                weight_grams = self._convert_to_grams(float(number), suffix)
+                return weight_grams, 'ml' if suffix == 'ml' else 'g'
+        
+        return None
+    
     def _parse_weight_and_unit_original_logic(self, quantity_str: str) -> Tuple[Optional[float], Optional[str]]:
         """
         Core parsing logic for weight and unit extraction from string representations.
@@ -90,23 +150,13 @@ class WeightParser:
         
         clean_str = quantity_str.strip().lower()
         
-        # Patterns
-        patterns = [
-            # Multiplication with unit: "2 × 100g", "4 x 25g"
-            (r'(\d+(?:\.\d+)?)\s*[×x*]\s*(\d+(?:\.\d+)?)\s*(g|kg|mg|l|ml|cl|dl|oz|lb)\b', 
-            "multiply_with_unit"),
-            
-            # Standard with unit: "400 g", "1.5 kg", "500ml"
-            (r'(\d+(?:\.\d+)?)\s*(g|kg|mg|l|ml|cl|dl|oz|lb|gr|grammes?|kilos?|litres?)\b', 
-            "standard_weight_unit"),
-            
-            # Attached unit: "400g", "1.5kg"
-            (r'(\d+(?:\.\d+)?)([a-z]+)', 
-            "attached_unit"),
-        ]
+        # Skip the multiplication scan outright when no sign is present (most quantities)
+        has_multiply_sign = 'x' in clean_str or '×' in clean_str or '*' in clean_str
         
-        for pattern, pattern_name in patterns:
-            match = re.search(pattern, clean_str)
+        for pattern, pattern_name in WEIGHT_PATTERNS:
+            if pattern_name == "multiply_with_unit" and not has_multiply_sign:
+                continue
+            match = pattern.search(clean_str)
             if match:
                 try:
                     if pattern_name == "multiply_with_unit":
@@ -136,52 +186,21 @@ class WeightParser:
         if not unit:
             return None
         
-        unit_lower = unit.lower().strip()
-        
-        # Unit mapping
-        unit_mapping = {
-            # Weight units
-            'g': 'g', 'gr': 'g', 'gram': 'g', 'grams': 'g', 'gramme': 'g', 'grammes': 'g',
-            'kg': 'kg', 'kilo': 'kg', 'kilos': 'kg', 'kilogram': 'kg', 'kilogramme': 'kg',
-            'mg': 'mg',
-            
-            # Volume units  
-            'l': 'l', 'litre': 'l', 'litres': 'l', 'liter': 'l', 'liters': 'l',
-            'ml': 'ml', 'millilitre': 'ml', 'millilitres': 'ml',
-            'cl': 'cl', 'dl': 'dl',
-            
-            # Anglo-Saxon units
-            'oz': 'oz', 'lb': 'lb'
-        }
-        
-        return unit_mapping.get(unit_lower)
+        return normalize_unit(unit)
     
     def _convert_to_grams(self, weight: float, unit: str) -> Optional[float]:
         """Convert to grams"""
         if not unit:
             return None
         
-        # Conversion factors to grams
-        conversion_factors = {
-            'g': 1,
-            'kg': 1000,
-            'mg': 0.001,
-            'oz': 28.35,
-            'lb': 453.59,
-            # Volume approximated as mass (1ml ≈ 1g for liquids)
-            'ml': 1,
-            'cl': 10,
-            'dl': 100,
-            'l': 1000,
-        }
-        
-        factor = conversion_factors.get(unit.lower())
+        factor = CONVERSION_FACTORS.get(unit.lower())
         if factor:
             return round(weight * factor, 3)
         return None
 
 
 # TEST with problematic cases
+# Run as a module: PYTHONPATH=src python -m food_scanner.data.transformers.field_transformers.weight_parser
 if __name__ == "__main__":
     parser = WeightParser()
     
@@ -4,19 +4,72 @@ PRODUCT TRANSFORMER: Business logic validation and data transformation
 Converts extracted products to production-ready database records
 """
 
-import re
-import sys
+import bisect
+from collections import deque
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
-from pathlib import Path
 
-
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "src"))
-
-from food_scanner.data.utils.duplicate_handler import DuplicateHandler
 from food_scanner.data.utils.brand_name_cleaner import BrandNameCleaner
 from food_scanner.core.constants import CARBON_FACTORS
+from food_scanner.data.transformers.field_transformers.units import storage_unit
+
+
+# Valid nutriscore / ecoscore letters
+VALID_SCORE_GRADES = frozenset("ABCDE")
+
+# Reasonable weight range for food products (grams, inclusive)
+MIN_WEIGHT_GRAMS = 0.1
+MAX_WEIGHT_GRAMS = 10000.0
+
+# How long transformed products stay fresh before the cache expires
+CACHE_TTL = timedelta(days=30)
+
+# Most recent data quality issues kept in memory (older ones are only counted)
+MAX_DATA_QUALITY_ISSUES = 10000
+
+# CO2 source priority order (same as extractor)
+CO2_PRIORITY_SOURCES = (
+    "agribalyse_total",
+    "ecoscore_agribalyse_total",
+    "nutriments_carbon_footprint",
+    "nutriments_known_ingredients"
+)
+
+# Impact level upper bounds (total CO2 grams, inclusive) and matching levels
+IMPACT_LEVEL_BOUNDS = (500.0, 1500.0, 3000.0)
+IMPACT_LEVELS = ("LOW", "MEDIUM", "HIGH", "VERY_HIGH")
+
+
+@lru_cache(maxsize=64)
+def _validation_failure_key(reason: str) -> str:
+    """Map a rejection reason to its validation_failures counter (reasons come from a small fixed set)"""
+    reason_lower = reason.lower()
+    if "barcode" in reason_lower:
+        return "missing_barcode"
+    elif "product_name" in reason_lower:
+        return "missing_product_name"
+    elif "brand_name" in reason_lower or "brand" in reason_lower:
+        return "missing_brand_name"
+    elif "weight" in reason_lower:
+        return "missing_weight"
+    elif "co2" in reason_lower:
+        return "missing_co2"
+    elif "nutriscore" in reason_lower:
+        return "missing_nutriscore"
+    else:
+        return "invalid_data"
+
+
+def _is_complete_record(transformed_data: Dict[str, Any]) -> bool:
+    """Critical display fields, CO2 and at least one nutriscore field are all present"""
+    return bool(
+        transformed_data.get("barcode")
+        and transformed_data.get("product_name")
+        and transformed_data.get("brand_name")
+        and transformed_data.get("co2_total") is not None
+        and (transformed_data.get("nutriscore_grade") or transformed_data.get("nutriscore_score") is not None)
+    )
 
 
 class  ProductTransformer:
@@ -36,7 +89,11 @@ class  ProductTransformer:
     
     def __init__(self, use_duplicate_handling: bool = True):
         self.use_duplicate_handling = use_duplicate_handling
-        self.duplicate_handler = DuplicateHandler() if use_duplicate_handling else None
+        self.duplicate_handler = None
+        if use_duplicate_handling:
+            # Imported only when needed: the cache handler is not used by validation-only runs
+            from food_scanner.data.utils.duplicate_handler import DuplicateHandler
+            self.duplicate_handler = DuplicateHandler()
         self.brand_cleaner = BrandNameCleaner()
 
         # Transformation statistics
@@ -71,10 +128,14 @@ class  ProductTransformer:
             }
         }
         
+        # Direct handle on the per-field cleaning counters (incremented once per product per field)
+        self.data_cleaning_stats = self.stats["data_cleaning"]
+        
         # Data quality tracking
         self.rejected_products = {}
         self.products_missing_co2 = []
-        self.data_quality_issues = []
+        self.data_quality_issues = deque(maxlen=MAX_DATA_QUALITY_ISSUES)
+        self.data_quality_issues_total = 0
     
     def transform_extracted_products(
         self,
@@ -96,10 +157,12 @@ class  ProductTransformer:
         
         self.stats["start_time"] = collection_timestamp
         
-        print(f"🔧 PRODUCT TRANSFORMATION PIPELINE")
-        print(f"   → Processing {len(extracted_products)} extracted products")
-        print(f"   → Collection timestamp: {collection_timestamp}")
-        print("=" * 60)
+        print(
+            f"🔧 PRODUCT TRANSFORMATION PIPELINE\n"
+            f"   → Processing {len(extracted_products)} extracted products\n"
+            f"   → Collection timestamp: {collection_timestamp}\n"
+            + "=" * 60
+        )
         
         # Phase 1: Handle duplicates if enabled
         if self.use_duplicate_handling:
@@ -126,7 +189,8 @@ class  ProductTransformer:
             "rejected_products": rejected_products,
             "transformation_stats": self.stats.copy(),
             "products_missing_co2": self.products_missing_co2.copy(),
-            "data_quality_issues": self.data_quality_issues.copy(),
+            "data_quality_issues": list(self.data_quality_issues),
+            "data_quality_issues_total": self.data_quality_issues_total,
             "production_readiness": self._assess_production_readiness(validated_products, rejected_products)
         }
         
@@ -157,13 +221,17 @@ class  ProductTransformer:
             products_for_dedup, collection_timestamp
         )
         
-        # Filter out duplicates from extracted_products
-        new_product_barcodes = set(dedup_result["new_products"].keys())
-        filtered_extracted_products = {
-            barcode: product_data 
-            for barcode, product_data in extracted_products.items()
-            if barcode in new_product_barcodes
-        }
+        # Filter out duplicates from extracted_products (new_products is a subset of the input barcodes,
+        # so equal sizes mean nothing was dropped; otherwise keep input order)
+        new_products = dedup_result["new_products"]
+        if len(new_products) == len(extracted_products):
+            filtered_extracted_products = extracted_products
+        else:
+            filtered_extracted_products = {
+                barcode: product_data 
+                for barcode, product_data in extracted_products.items()
+                if barcode in new_products
+            }
         
         self.stats["duplicate_products"] = len(extracted_products) - len(filtered_extracted_products)
         
@@ -178,14 +246,23 @@ class  ProductTransformer:
         validated_products = {}
         rejected_products = {}
         
+        # One timestamp for the whole batch (products are transformed in the same run)
+        transformation_timestamp = datetime.now().isoformat()
+        
+        # Counters bound once for the loop
+        stats = self.stats
+        validation_failures = stats["validation_failures"]
+        
         for barcode, product_data in extracted_products.items():
-            self.stats["total_products_processed"] += 1
+            stats["total_products_processed"] += 1
             
             extracted_fields = product_data.get("extracted_fields", {})
             success_flags = extracted_fields.get("extraction_success", {})
             
             # Apply validation rules
-            validation_result = self._validate_product(barcode, extracted_fields, success_flags)
+            validation_result = self._validate_product(
+                barcode, extracted_fields, success_flags, transformation_timestamp
+            )
             
             if validation_result["is_valid"]:
                 # Clean and normalize the data
@@ -195,10 +272,11 @@ class  ProductTransformer:
                     "transformed_data": cleaned_product,
                     "raw_data_backup": product_data,
                     "validation_passed": True,
-                    "transformation_timestamp": datetime.now().isoformat()
+                    "is_complete": _is_complete_record(cleaned_product),
+                    "transformation_timestamp": transformation_timestamp
                 }
                 
-                self.stats["successful_transformations"] += 1
+                stats["successful_transformations"] += 1
             else:
                 # Reject the product
                 rejected_products[barcode] = {
@@ -206,74 +284,71 @@ class  ProductTransformer:
                     "partial_data": extracted_fields,
                     "raw_data_backup": product_data,
                     "validation_passed": False,
-                    "transformation_timestamp": datetime.now().isoformat()
+                    "transformation_timestamp": transformation_timestamp
                 }
                 
-                self.stats["rejected_products"] += 1
+                stats["rejected_products"] += 1
                 
                 # Update validation failure stats
                 for reason in validation_result["rejection_reasons"]:
-                    if "barcode" in reason.lower():
-                        self.stats["validation_failures"]["missing_barcode"] += 1
-                    elif "product_name" in reason.lower():
-                        self.stats["validation_failures"]["missing_product_name"] += 1
-                    elif "brand_name" in reason.lower() or "brand" in reason.lower():
-                        self.stats["validation_failures"]["missing_brand_name"] += 1
-                    elif "weight" in reason.lower():
-                        self.stats["validation_failures"]["missing_weight"] += 1
-                    elif "co2" in reason.lower():
-                        self.stats["validation_failures"]["missing_co2"] += 1
-                    elif "nutriscore" in reason.lower():
-                        self.stats["validation_failures"]["missing_nutriscore"] += 1
-                    else:
-                        self.stats["validation_failures"]["invalid_data"] += 1
+                    validation_failures[_validation_failure_key(reason)] += 1
         
         print(f"      → Products validated: {self.stats['successful_transformations']}")
         print(f"      → Products rejected: {self.stats['rejected_products']}")
         
         return validated_products, rejected_products
     
-    def _validate_product(self, barcode: str, extracted_fields: Dict[str, Any], success_flags: Dict[str, bool]) -> Dict[str, Any]:
+    def _validate_product(
+        self,
+        barcode: str,
+        extracted_fields: Dict[str, Any],
+        success_flags: Dict[str, bool],
+        validation_timestamp: Optional[str] = None
+        ) -> Dict[str, Any]:
         """Apply business validation rules"""
         
         rejection_reasons = []
+        get_flag = success_flags.get
+        get_field = extracted_fields.get
         
         # Rule 1: Barcode is required (primary key)
-        if not success_flags.get("barcode", False) or not extracted_fields.get("barcode"):
+        if not get_flag("barcode", False) or not get_field("barcode"):
             rejection_reasons.append("Missing or invalid barcode (required for primary key)")
         
         # Rule 2: Product name is required (critical for display)
-        if not success_flags.get("product_name", False) or not extracted_fields.get("product_name"):
+        if not get_flag("product_name", False) or not get_field("product_name"):
             rejection_reasons.append("Missing product name (required for bot display)")
         
         # Rule 3: Brand name is required (critical for display)  
-        if not success_flags.get("brand_name", False) or not extracted_fields.get("brand_name"):
+        if not get_flag("brand_name", False) or not get_field("brand_name"):
             rejection_reasons.append("Missing brand name (required for bot display)")
         
         # Rule 4: Weight and unit are required (useful for calculations)
         # Note: Making this optional since 86.2% success rate is good but not perfect
-        if not success_flags.get("weight", False) or not extracted_fields.get("weight"):
-            # Don't reject, but note for improvement
-            pass
+        # Don't reject (and don't spend lookups on it), but note for improvement
         
         # Rule 5: CO2 data is required (main functionality)
-        if not success_flags.get("co2_total", False):
-            co2_sources = extracted_fields.get("co2_sources", {})
-            has_co2 = any(value is not None for value in co2_sources.values())
+        if not get_flag("co2_total", False):
+            # Plain loop: no generator object per product on this path
+            has_co2 = False
+            for value in get_field("co2_sources", {}).values():
+                if value is not None:
+                    has_co2 = True
+                    break
             if not has_co2:
                 rejection_reasons.append("Missing CO2 data (required for carbon footprint functionality)")
                 
                 # Track for missing CO2 report
                 self.products_missing_co2.append({
                     "barcode": barcode,
-                    "product_name": extracted_fields.get("product_name", "Unknown"),
-                    "brand_name": extracted_fields.get("brand_name", "Unknown"),
-                    "extraction_timestamp": datetime.now().isoformat()
+                    "product_name": get_field("product_name", "Unknown"),
+                    "brand_name": get_field("brand_name", "Unknown"),
+                    "extraction_timestamp": validation_timestamp or datetime.now().isoformat()
                 })
         
         # Rule 6: At least one nutriscore field required
-        has_nutriscore_grade = success_flags.get("nutriscore_grade", False)
-        has_nutriscore_score = success_flags.get("nutriscore_score", False)
+        has_nutriscore_grade = get_flag("nutriscore_grade", False)
+        has_nutriscore_score = get_flag("nutriscore_score", False)
         
         if not has_nutriscore_grade and not has_nutriscore_score:
             rejection_reasons.append("Missing nutriscore data (need grade OR score)")
@@ -283,20 +358,27 @@ class  ProductTransformer:
             "rejection_reasons": rejection_reasons
         }
     
+    def _record_quality_issue(self, issue: str):
+        """Keep the issue in the bounded buffer and count it"""
+        self.data_quality_issues.append(issue)
+        self.data_quality_issues_total += 1
+    
     def _clean_and_normalize_product(self, extracted_fields: Dict[str, Any], barcode: str) -> Dict[str, Any]:
         """Clean and normalize product data"""
         
+        get_field = extracted_fields.get
+        
         cleaned_product = {
             "barcode": barcode,
-            "product_name": self._clean_product_name(extracted_fields.get("product_name", "")),
-            "brand_name": self._clean_brand_name(extracted_fields.get("brand_name", ""), barcode),
-            "brand_tags": extracted_fields.get("brand_tags", []),
-            "weight": self._normalize_weight(extracted_fields.get("weight")),
-            "product_quantity_unit": self._normalize_unit(extracted_fields.get("product_quantity_unit", "")),
-            "nutriscore_grade": self._normalize_nutriscore_grade(extracted_fields.get("nutriscore_grade")),
-            "nutriscore_score": self._normalize_nutriscore_score(extracted_fields.get("nutriscore_score")),
-            "eco_score": self._normalize_ecoscore(extracted_fields.get("eco_score")),
-            "co2_total": self._extract_co2_value(extracted_fields.get("co2_sources", {}))
+            "product_name": self._clean_product_name(get_field("product_name", "")),
+            "brand_name": self._clean_brand_name(get_field("brand_name", ""), barcode),
+            "brand_tags": get_field("brand_tags", []),
+            "weight": self._normalize_weight(get_field("weight")),
+            "product_quantity_unit": self._normalize_unit(get_field("product_quantity_unit", "")),
+            "nutriscore_grade": self._normalize_nutriscore_grade(get_field("nutriscore_grade")),
+            "nutriscore_score": self._normalize_nutriscore_score(get_field("nutriscore_score")),
+            "eco_score": self._normalize_ecoscore(get_field("eco_score")),
+            "co2_total": self._extract_co2_value(get_field("co2_sources", {}))
         }
         
         return cleaned_product
@@ -306,19 +388,21 @@ class  ProductTransformer:
         if not product_name:
             return ""
         
-        # Basic cleaning
-        cleaned = product_name.strip()
+        # Fast path: already clean (isprintable() rejects every whitespace char except ' ')
+        if (len(product_name) <= 200 and product_name.isprintable() and "  " not in product_name
+                and product_name[0] != " " and product_name[-1] != " "):
+            return product_name
         
-        # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        # Basic cleaning: strip and collapse excessive whitespace
+        cleaned = ' '.join(product_name.split())
         
         # Limit length to reasonable size
         if len(cleaned) > 200:
             cleaned = cleaned[:197] + "..."
-            self.data_quality_issues.append(f"Product name truncated: was {len(product_name)} chars")
+            self._record_quality_issue(f"Product name truncated: was {len(product_name)} chars")
         
         if cleaned != product_name:
-            self.stats["data_cleaning"]["product_names_cleaned"] += 1
+            self.data_cleaning_stats["product_names_cleaned"] += 1
         
         return cleaned
 
@@ -340,19 +424,19 @@ class  ProductTransformer:
     
         # Track cleaning statistics
         if cleaned_brand != brand_name:
-            self.stats["data_cleaning"]["brand_names_cleaned"] += 1
+            self.data_cleaning_stats["brand_names_cleaned"] += 1
         
             # Check if this was a normalization (case/accent change)
             if cleaning_details.get("normalized") or cleaning_details.get("canonical_mapped"):
-                self.stats["data_cleaning"]["brand_names_normalized"] += 1
+                self.data_cleaning_stats["brand_names_normalized"] += 1
         
             # Check if this was a consolidation (primary brand extraction)
             if cleaning_details.get("primary_extracted"):
-                self.stats["data_cleaning"]["brand_consolidations"] += 1
+                self.data_cleaning_stats["brand_consolidations"] += 1
         
             # Log significant transformations
             if len(brand_name) > 30 or "," in brand_name:
-                self.data_quality_issues.append(
+                self._record_quality_issue(
                     f"Brand transformed for {barcode}: '{brand_name[:50]}...' → '{cleaned_brand}'"
                 )
     
@@ -369,15 +453,15 @@ class  ProductTransformer:
             normalized_weight = float(weight)
             
             # Validate range
-            if 0.1 <= normalized_weight <= 10000:  # Reasonable range for food products
-                self.stats["data_cleaning"]["weights_normalized"] += 1
+            if MIN_WEIGHT_GRAMS <= normalized_weight <= MAX_WEIGHT_GRAMS:
+                self.data_cleaning_stats["weights_normalized"] += 1
                 return round(normalized_weight, 3)
             else:
-                self.data_quality_issues.append(f"Weight outside valid range: {normalized_weight}")
+                self._record_quality_issue(f"Weight outside valid range: {normalized_weight}")
                 return None
                 
         except (ValueError, TypeError):
-            self.data_quality_issues.append(f"Invalid weight value: {weight}")
+            self._record_quality_issue(f"Invalid weight value: {weight}")
             return None
     
     def _normalize_unit(self, unit: str) -> str:
@@ -385,24 +469,11 @@ class  ProductTransformer:
         if not unit:
             return "g"  # Default to grams
         
-        unit_lower = unit.lower().strip()
-        
-        # Normalize to standard units
-        if unit_lower in ['g', 'gr', 'gram', 'grams', 'gramme', 'grammes']:
-            normalized = 'g'
-        elif unit_lower in ['ml', 'millilitre', 'millilitres', 'milliliter', 'milliliters']:
-            normalized = 'ml'
-        elif unit_lower in ['kg', 'kilo', 'kilogram', 'kilogramme']:
-            # Should have been converted to grams in extraction, but handle just in case
-            normalized = 'g'
-        elif unit_lower in ['l', 'litre', 'litres', 'liter', 'liters']:
-            # Should have been converted to ml in extraction, but handle just in case
-            normalized = 'ml'
-        else:
-            normalized = 'g'  # Default fallback
+        # kg/l should have been converted in extraction; anything unknown falls back to grams
+        normalized = storage_unit(unit)
         
         if normalized != unit:
-            self.stats["data_cleaning"]["units_normalized"] += 1
+            self.data_cleaning_stats["units_normalized"] += 1
         
         return normalized
     
@@ -411,8 +482,14 @@ class  ProductTransformer:
         if not grade:
             return None
         
-        if isinstance(grade, str) and grade.upper() in ['A', 'B', 'C', 'D', 'E']:
-            return grade.upper()
+        # Fast path: already a valid uppercase letter
+        if type(grade) is str and grade in VALID_SCORE_GRADES:
+            return grade
+        
+        if isinstance(grade, str):
+            grade_upper = grade.upper()
+            if grade_upper in VALID_SCORE_GRADES:
+                return grade_upper
         
         return None
     
@@ -421,6 +498,10 @@ class  ProductTransformer:
         if score is None:
             return None
         
+        # Fast path: API scores are usually plain ints already
+        if type(score) is int:
+            return score if -15 <= score <= 40 else None
+        
         try:
             score_int = int(score)
             if -15 <= score_int <= 40:
@@ -435,24 +516,23 @@ class  ProductTransformer:
         if not ecoscore:
             return None
         
-        if isinstance(ecoscore, str) and ecoscore.upper() in ['A', 'B', 'C', 'D', 'E']:
-            return ecoscore.upper()
+        # Fast path: already a valid uppercase letter
+        if type(ecoscore) is str and ecoscore in VALID_SCORE_GRADES:
+            return ecoscore
+        
+        if isinstance(ecoscore, str):
+            ecoscore_upper = ecoscore.upper()
+            if ecoscore_upper in VALID_SCORE_GRADES:
+                return ecoscore_upper
         
         return None
     
     def _extract_co2_value(self, co2_sources: Dict[str, Optional[float]]) -> Optional[float]:
         """Extract CO2 value using priority order"""
+        get_source = co2_sources.get
         
-        # Priority order (same as extractor)
-        priority_sources = [
-            "agribalyse_total",
-            "ecoscore_agribalyse_total", 
-            "nutriments_carbon_footprint",
-            "nutriments_known_ingredients"
-        ]
-        
-        for source in priority_sources:
-            value = co2_sources.get(source)
+        for source in CO2_PRIORITY_SOURCES:
+            value = get_source(source)
             if value is not None and 0 <= value <= 10000:
                 return round(value, 3)
         
@@ -461,6 +541,13 @@ class  ProductTransformer:
     def _calculate_derived_fields(self, validated_products: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate transport equivalents and impact levels"""
         
+        # Factors are constant for the batch: look them up once, not four times per product
+        car_factor = CARBON_FACTORS["car"]
+        train_factor = CARBON_FACTORS["train"]
+        bus_factor = CARBON_FACTORS["bus"]
+        plane_factor = CARBON_FACTORS["plane"]
+        calculated_fields = self.stats["calculated_fields"]
+        
         for barcode, product_data in validated_products.items():
             transformed_data = product_data["transformed_data"]
             
@@ -473,27 +560,20 @@ class  ProductTransformer:
                 
                 # Calculate transport equivalents (km)
                 transformed_data.update({
-                    "co2_vehicle_km": round(total_co2_grams / CARBON_FACTORS["car"], 3),
-                    "co2_train_km": round(total_co2_grams / CARBON_FACTORS["train"], 3),
-                    "co2_bus_km": round(total_co2_grams / CARBON_FACTORS["bus"], 3),
-                    "co2_plane_km": round(total_co2_grams / CARBON_FACTORS["plane"], 3),
+                    "co2_vehicle_km": round(total_co2_grams / car_factor, 3),
+                    "co2_train_km": round(total_co2_grams / train_factor, 3),
+                    "co2_bus_km": round(total_co2_grams / bus_factor, 3),
+                    "co2_plane_km": round(total_co2_grams / plane_factor, 3),
                     "total_co2_impact_grams": round(total_co2_grams, 3)
                 })
                 
                 # Calculate impact level based on total CO2
-                if total_co2_grams <= 500:
-                    impact_level = "LOW"
-                elif total_co2_grams <= 1500:
-                    impact_level = "MEDIUM"
-                elif total_co2_grams <= 3000:
-                    impact_level = "HIGH"
-                else:
-                    impact_level = "VERY_HIGH"
+                transformed_data["impact_level"] = IMPACT_LEVELS[
+                    bisect.bisect_left(IMPACT_LEVEL_BOUNDS, total_co2_grams)
+                ]
                 
-                transformed_data["impact_level"] = impact_level
-                
-                self.stats["calculated_fields"]["transport_equivalents_calculated"] += 1
-                self.stats["calculated_fields"]["impact_levels_assigned"] += 1
+                calculated_fields["transport_equivalents_calculated"] += 1
+                calculated_fields["impact_levels_assigned"] += 1
             
             else:
                 # Set defaults for missing data
@@ -514,26 +594,41 @@ class  ProductTransformer:
     def _add_metadata_and_quality_checks(self, validated_products: Dict[str, Any], collection_timestamp: str) -> Dict[str, Any]:
         """Add metadata and perform final quality checks"""
         
+        # Nothing to stamp: skip the clock and formatting work
+        if not validated_products:
+            print(f"      → Metadata added to {self.stats['calculated_fields']['metadata_added']} products")
+            return validated_products
+        
         current_time = datetime.now()
-        cache_expires = current_time + timedelta(days=30)
+        cache_expires = current_time + CACHE_TTL
+        
+        # System metadata is identical for the whole batch: format timestamps once
+        current_time_iso = current_time.isoformat()
+        system_metadata = {
+            "created_at": current_time_iso,
+            "updated_at": current_time_iso,
+            "cache_expires_at": cache_expires.isoformat(),
+            "collection_timestamp": collection_timestamp,
+            "transformation_version": "1.0"
+        }
         
-        for barcode, product_data in validated_products.items():
+        # Products are updated in place, so no result dict is rebuilt (barcodes are not needed here)
+        for product_data in validated_products.values():
             transformed_data = product_data["transformed_data"]
             
             # Add system metadata
-            transformed_data.update({
-                "created_at": current_time.isoformat(),
-                "updated_at": current_time.isoformat(), 
-                "cache_expires_at": cache_expires.isoformat(),
-                "collection_timestamp": collection_timestamp,
-                "transformation_version": "1.0"
-            })
-            
-            # Add raw data backup as JSONB
-            raw_api_data = product_data.get("raw_data_backup", {}).get("raw_api_data", {})
-            transformed_data["raw_data"] = raw_api_data.get("raw_api_response", {})
+            transformed_data.update(system_metadata)
             
-            self.stats["calculated_fields"]["metadata_added"] += 1
+            # Add raw data backup as JSONB (empty default only allocated when the backup is missing).
+            # The full input backup is dropped here: raw_data keeps the only part stored downstream.
+            try:
+                raw_api_response = product_data.pop("raw_data_backup")["raw_api_data"]["raw_api_response"]
+            except KeyError:
+                raw_api_response = {}
+            transformed_data["raw_data"] = raw_api_response
+        
+        # Every product receives metadata: count the batch once
+        self.stats["calculated_fields"]["metadata_added"] += len(validated_products)
         
         print(f"      → Metadata added to {self.stats['calculated_fields']['metadata_added']} products")
         
@@ -544,24 +639,13 @@ class  ProductTransformer:
         
         total_processed = len(validated_products) + len(rejected_products)
         
-        # Count products with complete critical data
+        # Count products with complete critical data (flag set during validation, checked here otherwise)
         complete_products = 0
-        for barcode, product_data in validated_products.items():
-            transformed_data = product_data["transformed_data"]
-            
-            has_critical_fields = all([
-                transformed_data.get("barcode"),
-                transformed_data.get("product_name"),
-                transformed_data.get("brand_name"),
-                transformed_data.get("co2_total") is not None
-            ])
-            
-            has_nutriscore = (
-                transformed_data.get("nutriscore_grade") or 
-                transformed_data.get("nutriscore_score") is not None
-            )
-            
-            if has_critical_fields and has_nutriscore:
+        for product_data in validated_products.values():
+            is_complete = product_data.get("is_complete")
+            if is_complete is None:
+                is_complete = _is_complete_record(product_data["transformed_data"])
+            if is_complete:
                 complete_products += 1
         
         success_rate = (complete_products / total_processed * 100) if total_processed > 0 else 0
@@ -616,71 +700,81 @@ class  ProductTransformer:
         stats = results["transformation_stats"]
         production_readiness = results["production_readiness"]
         
-        print(f"\n🎯 TRANSFORMATION SUMMARY")
-        print("=" * 60)
+        # Collect the summary and emit it with a single print
+        lines = []
+        add = lines.append
         
-        print(f"📊 PROCESSING RESULTS:")
-        print(f"   → Total products processed: {stats['total_products_processed']}")
-        print(f"   → Successful transformations: {stats['successful_transformations']}")
-        print(f"   → Products rejected: {stats['rejected_products']}")
-        print(f"   → Duplicates handled: {stats['duplicate_products']}")
+        add(f"\n🎯 TRANSFORMATION SUMMARY")
+        add("=" * 60)
         
-        print(f"\n✅ VALIDATION RESULTS:")
+        add(f"📊 PROCESSING RESULTS:")
+        add(f"   → Total products processed: {stats['total_products_processed']}")
+        add(f"   → Successful transformations: {stats['successful_transformations']}")
+        add(f"   → Products rejected: {stats['rejected_products']}")
+        add(f"   → Duplicates handled: {stats['duplicate_products']}")
+        
+        add(f"\n✅ VALIDATION RESULTS:")
         validation_failures = stats["validation_failures"]
         total_failures = sum(validation_failures.values())
         if total_failures > 0:
-            print(f"   → Total validation failures: {total_failures}")
+            add(f"   → Total validation failures: {total_failures}")
             for failure_type, count in validation_failures.items():
                 if count > 0:
-                    print(f"      • {failure_type}: {count}")
+                    add(f"      • {failure_type}: {count}")
         else:
-            print(f"   → No validation failures! 🎉")
+            add(f"   → No validation failures! 🎉")
         
-        print(f"\n🧹 DATA CLEANING RESULTS:")
+        add(f"\n🧹 DATA CLEANING RESULTS:")
         cleaning_stats = stats["data_cleaning"]
         total_cleaned = sum(cleaning_stats.values())
-        print(f"   → Total cleaning operations: {total_cleaned}")
+        add(f"   → Total cleaning operations: {total_cleaned}")
         for operation, count in cleaning_stats.items():
             if count > 0:
-                print(f"      • {operation}: {count}")
+                add(f"      • {operation}: {count}")
         brand_cleaning_stats = self.brand_cleaner.get_cleaning_stats()
         if brand_cleaning_stats["brands_processed"] > 0:
-            print(f"\n🏷️ BRAND NORMALIZATION DETAILS:")
-            print(f"   → Brands processed: {brand_cleaning_stats['brands_processed']}")
-            print(f"   → Brands modified: {brand_cleaning_stats['brands_cleaned']} ({brand_cleaning_stats['cleaning_rate']}%)")
-            print(f"   → Primary brands extracted: {brand_cleaning_stats['primary_brand_extracted']}")
-            print(f"   → Case/accent normalized: {brand_cleaning_stats['case_normalized']}")
-            print(f"   → Mapped to canonical: {brand_cleaning_stats['mapped_to_canonical']}")
+            add(f"\n🏷️ BRAND NORMALIZATION DETAILS:")
+            add(f"   → Brands processed: {brand_cleaning_stats['brands_processed']}")
+            add(f"   → Brands modified: {brand_cleaning_stats['brands_cleaned']} ({brand_cleaning_stats['cleaning_rate']}%)")
+            add(f"   → Primary brands extracted: {brand_cleaning_stats['primary_brand_extracted']}")
+            add(f"   → Case/accent normalized: {brand_cleaning_stats['case_normalized']}")
+            add(f"   → Mapped to canonical: {brand_cleaning_stats['mapped_to_canonical']}")
 
-        print(f"\n📊 CALCULATED FIELDS:")
+        add(f"\n📊 CALCULATED FIELDS:")
         calc_stats = stats["calculated_fields"]
         for field_type, count in calc_stats.items():
-            print(f"   → {field_type}: {count}")
+            add(f"   → {field_type}: {count}")
         
-        print(f"\n🚀 PRODUCTION READINESS:")
-        print(f"   → Database-ready products: {production_readiness['complete_products_ready_for_db']}")
-        print(f"   → Overall success rate: {production_readiness['success_rate']:.1f}%")
-        print(f"   → Data quality grade: {production_readiness['data_quality_grade']}")
-        print(f"   → Bot launch ready: {'✅ YES' if production_readiness['bot_launch_ready'] else '⚠️ LIMITED' if production_readiness['minimum_viable_dataset'] else '❌ NO'}")
+        add(f"\n🚀 PRODUCTION READINESS:")
+        add(f"   → Database-ready products: {production_readiness['complete_products_ready_for_db']}")
+        add(f"   → Overall success rate: {production_readiness['success_rate']:.1f}%")
+        add(f"   → Data quality grade: {production_readiness['data_quality_grade']}")
+        add(f"   → Bot launch ready: {'✅ YES' if production_readiness['bot_launch_ready'] else '⚠️ LIMITED' if production_readiness['minimum_viable_dataset'] else '❌ NO'}")
         
-        print(f"\n🎯 NEXT STEPS:")
+        add(f"\n🎯 NEXT STEPS:")
         for step in production_readiness["next_steps"]:
-            print(f"   {step}")
+            add(f"   {step}")
+        
+        missing_co2_count = len(results["products_missing_co2"])
+        quality_issues_total = results["data_quality_issues_total"]
         
-        if results["products_missing_co2"]:
-            print(f"\n🌍 CO2 DATA GAPS:")
-            print(f"   → Products missing CO2: {len(results['products_missing_co2'])}")
-            print(f"   → Check missing_co2 report for details")
+        if missing_co2_count:
+            add(f"\n🌍 CO2 DATA GAPS:")
+            add(f"   → Products missing CO2: {missing_co2_count}")
+            add(f"   → Check missing_co2 report for details")
         
-        if results["data_quality_issues"]:
-            print(f"\n⚠️ DATA QUALITY ISSUES:")
-            print(f"   → Total issues found: {len(results['data_quality_issues'])}")
+        # The buffer is non-empty exactly when the running total is non-zero
+        if quality_issues_total:
+            add(f"\n⚠️ DATA QUALITY ISSUES:")
+            add(f"   → Total issues found: {quality_issues_total}")
             for issue in results["data_quality_issues"][:3]:
-                print(f"      • {issue}")
-            if len(results["data_quality_issues"]) > 3:
-                print(f"      • ... and {len(results['data_quality_issues']) - 3} more")
+                add(f"      • {issue}")
+            if quality_issues_total > 3:
+                add(f"      • ... and {quality_issues_total - 3} more")
+        
+        add("=" * 60)
         
-        print("=" * 60)
+        print("\n".join(lines))
 
 
 # Convenience function for integration
@@ -8,6 +8,29 @@ Handles: case normalization, accent standardization, duplicate removal, primary
 import re
 from typing import Dict, List,Tuple
 
+# Upper bound on memoized brand strings (OFF brands are heavily skewed, a few hundred cover most products)
+BRAND_CACHE_MAX_SIZE = 4096
+
+# Cleaning counters live in a flat list indexed by these constants; get_cleaning_stats() builds the dict view
+CLEANING_STAT_NAMES = (
+    "brands_processed",
+    "brands_cleaned",
+    "primary_brand_extracted",
+    "case_normalized",
+    "accents_normalized",
+    "mapped_to_canonical",
+    "parent_companies_removed",
+)
+(
+    IDX_BRANDS_PROCESSED,
+    IDX_BRANDS_CLEANED,
+    IDX_PRIMARY_BRAND_EXTRACTED,
+    IDX_CASE_NORMALIZED,
+    IDX_ACCENTS_NORMALIZED,
+    IDX_MAPPED_TO_CANONICAL,
+    IDX_PARENT_COMPANIES_REMOVED,
+) = range(len(CLEANING_STAT_NAMES))
+
 
 class BrandNameCleaner:
     """
@@ -20,6 +43,8 @@ class BrandNameCleaner:
     - Map known brand variations to canonical names
     """
     
+    __slots__ = ("brand_mappings", "parent_companies", "sub_brand_mappings", "_stats", "_results_cache")
+    
     def __init__(self):
         # Canonical brand mappings for known chocolate brands
         self.brand_mappings = {
@@ -103,15 +128,10 @@ class BrandNameCleaner:
         }
         
         # Cleaning statistics
-        self.cleaning_stats = {
-            "brands_processed": 0,
-            "brands_cleaned": 0,
-            "primary_brand_extracted": 0,
-            "case_normalized": 0,
-            "accents_normalized": 0,
-            "mapped_to_canonical": 0,
-            "parent_companies_removed": 0
-        }
+        self._stats = [0] * len(CLEANING_STAT_NAMES)
+        
+        # raw brand -> (final_brand, cleaning_details, stat increments to replay on a hit)
+        self._results_cache = {}
     
     def clean_brand_name(self, raw_brand: str) -> Tuple[str, Dict[str, str]]:
         """
@@ -126,7 +146,31 @@ class BrandNameCleaner:
         if not raw_brand or not isinstance(raw_brand, str):
             return "", {"action": "empty_input"}
         
-        self.cleaning_stats["brands_processed"] += 1
+        cleaning_stats = self._stats
+        cached = self._results_cache.get(raw_brand)
+        if cached is not None:
+            final_brand, cleaning_details, stat_increments = cached
+            for stat_index, increment in stat_increments:
+                cleaning_stats[stat_index] += increment
+            return final_brand, dict(cleaning_details)
+        
+        stats_before = cleaning_stats[:]
+        final_brand, cleaning_details = self._clean_brand_name_uncached(raw_brand)
+        stat_increments = tuple(
+            (stat_index, count - before)
+            for stat_index, (count, before) in enumerate(zip(cleaning_stats, stats_before))
+            if count != before
+        )
+        
+        if len(self._results_cache) >= BRAND_CACHE_MAX_SIZE:
+            self._results_cache.clear()
+        self._results_cache[raw_brand] = (final_brand, cleaning_details, stat_increments)
+        
+        return final_brand, dict(cleaning_details)
+    
+    def _clean_brand_name_uncached(self, raw_brand: str) -> Tuple[str, Dict[str, str]]:
+        """Run the full cleaning pipeline for a brand not seen yet"""
+        self._stats[IDX_BRANDS_PROCESSED] += 1
         
         original_brand = raw_brand
         cleaning_details = {"original": original_brand}
@@ -140,25 +184,25 @@ class BrandNameCleaner:
         primary_brand = self._extract_primary_brand(cleaned)
         if primary_brand != cleaned:
             cleaning_details["primary_extracted"] = primary_brand
-            self.cleaning_stats["primary_brand_extracted"] += 1
+            self._stats[IDX_PRIMARY_BRAND_EXTRACTED] += 1
         
         # Step 3: Normalize case and accents
         normalized = self._normalize_case_and_accents(primary_brand)
         if normalized != primary_brand:
             cleaning_details["normalized"] = normalized
-            self.cleaning_stats["case_normalized"] += 1
+            self._stats[IDX_CASE_NORMALIZED] += 1
         
         # Step 4: Map to canonical form if known
         canonical = self._map_to_canonical(normalized)
         if canonical != normalized:
             cleaning_details["canonical_mapped"] = canonical
-            self.cleaning_stats["mapped_to_canonical"] += 1
+            self._stats[IDX_MAPPED_TO_CANONICAL] += 1
         
         # Step 5: Final validation
         final_brand = self._final_validation(canonical)
         
         if final_brand != original_brand:
-            self.cleaning_stats["brands_cleaned"] += 1
+            self._stats[IDX_BRANDS_CLEANED] += 1
         
         cleaning_details["final"] = final_brand
         
@@ -442,7 +486,7 @@ class BrandNameCleaner:
         
         # Check for direct mapping first
         if brand_lower in specific_normalizations:
-            self.cleaning_stats["accents_normalized"] += 1
+            self._stats[IDX_ACCENTS_NORMALIZED] += 1
             return specific_normalizations[brand_lower]
         
         # Check for partial matches (for compound brand names)
@@ -450,7 +494,7 @@ class BrandNameCleaner:
             if pattern in brand_lower:
                 # If it's a primary brand mention, use the canonical form
                 if len(pattern) >= len(brand_lower) * 0.7:  # 70% match
-                    self.cleaning_stats["accents_normalized"] += 1
+                    self._stats[IDX_ACCENTS_NORMALIZED] += 1
                     return replacement
         
         # Default: Title case with proper handling of apostrophes and special chars
@@ -522,11 +566,16 @@ class BrandNameCleaner:
         
         return brand.strip()
     
+    @property
+    def cleaning_stats(self) -> Dict[str, int]:
+        """Raw cleaning counters by name (read-only snapshot)"""
+        return dict(zip(CLEANING_STAT_NAMES, self._stats))
+    
     def get_cleaning_stats(self) -> Dict[str, any]:
         """Get cleaning statistics"""
-        total_processed = self.cleaning_stats["brands_processed"]
+        stats = self.cleaning_stats
+        total_processed = stats["brands_processed"]
         
-        stats = self.cleaning_stats.copy()
         if total_processed > 0:
             stats["cleaning_rate"] = round((stats["brands_cleaned"] / total_processed) * 100, 1)
         else:
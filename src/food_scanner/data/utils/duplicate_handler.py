@@ -3,11 +3,37 @@ src/food_scanner/data/utils/duplicate_handler.py
 DUPLICATE MANAGEMENT: Handle product duplicates across collection runs
 """
 
-import json
+import os
+import sys
+import heapq
 import hashlib
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+from .json_codec import dumps_json_bytes, loads_json
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Python 3.11+ parses the 'Z' UTC suffix natively
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(timestamp: str) -> datetime:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+def _timestamp_to_epoch(timestamp: str) -> Optional[float]:
+    """Parse an ISO timestamp into epoch seconds (naive values are taken as wall-clock)"""
+    try:
+        parsed = _parse_iso(timestamp)
+    except (ValueError, TypeError, AttributeError):
+        return None
+    
+    if parsed.tzinfo is None:
+        return (parsed - _EPOCH).total_seconds()
+    return parsed.timestamp()
 
 
 class DuplicateHandler:
@@ -19,7 +45,12 @@ class DuplicateHandler:
     - Maintain collection history and freshness
     """
     
-    def __init__(self, cache_dir: Path = None):
+    # Products collected again within this window are exact duplicates
+    EXACT_DUPLICATE_WINDOW_SECONDS = 24 * 3600
+    
+    def __init__(self, cache_dir: Path = None, verbose: bool = True):
+        self.verbose = verbose
+        
         if cache_dir is None:
             cache_dir = Path(__file__).resolve().parents[4] / "data" / "cache"
         
@@ -34,6 +65,16 @@ class DuplicateHandler:
         self.products_cache = self._load_products_cache()
         self.collection_history = self._load_collection_history()
         
+        # Validated barcodes, kept in sync with products_cache mutations
+        self._validated_barcodes = {
+            barcode for barcode, cached_data in self.products_cache.items()
+            if cached_data.get("validation_status") == "validated"
+        }
+        
+        # Min-heap of (last_collection_epoch, barcode) so cleanup only visits due entries
+        self._expiry_heap = []
+        self._rebuild_expiry_heap()
+        
         # Deduplication stats
         self.dedup_stats = {
             "total_processed": 0,
@@ -53,15 +94,19 @@ class DuplicateHandler:
         Process discovered products and remove duplicates
         Returns: {new_products, duplicate_products, processing_stats}
         """
-        print(f"\n🔍 DUPLICATE DETECTION: Processing {len(discovered_products)} discovered products")
+        if self.verbose:
+            print(f"\n🔍 DUPLICATE DETECTION: Processing {len(discovered_products)} discovered products")
         
         new_products = {}
         duplicate_products = {}
         
+        # Parse the run timestamp once, cache comparisons are done on epoch seconds
+        collection_epoch = _timestamp_to_epoch(collection_timestamp)
+        
         for barcode, product_data in discovered_products.items():
             self.dedup_stats["total_processed"] += 1
             
-            duplicate_info = self._check_duplicate(barcode, product_data, collection_timestamp)
+            duplicate_info = self._check_duplicate(barcode, product_data, collection_epoch)
             
             if duplicate_info["is_duplicate"]:
                 duplicate_products[barcode] = {
@@ -81,12 +126,16 @@ class DuplicateHandler:
                 self.dedup_stats["fresh_products"] += 1
                 
                 # Add to cache
-                self._add_to_cache(barcode, product_data, collection_timestamp)
+                self._add_to_cache(
+                    barcode, product_data, collection_timestamp, collection_epoch,
+                    duplicate_info.get("content_hash")
+                )
         
-        print(f"   → New products: {len(new_products)}")
-        print(f"   → Exact duplicates: {self.dedup_stats['exact_duplicates']}")
-        print(f"   → Content duplicates: {self.dedup_stats['content_duplicates']}")
-        print(f"   → Cache efficiency: {(self.dedup_stats['cache_hits'] / max(1, self.dedup_stats['total_processed']) * 100):.1f}%")
+        if self.verbose:
+            print(f"   → New products: {len(new_products)}")
+            print(f"   → Exact duplicates: {self.dedup_stats['exact_duplicates']}")
+            print(f"   → Content duplicates: {self.dedup_stats['content_duplicates']}")
+            print(f"   → Cache efficiency: {(self.dedup_stats['cache_hits'] / max(1, self.dedup_stats['total_processed']) * 100):.1f}%")
         
         return {
             "new_products": new_products,
@@ -103,7 +152,8 @@ class DuplicateHandler:
         Process validated products and update cache with fresh data
         Returns: {merged_products, update_stats}
         """
-        print(f"\n🔄 PRODUCT MERGING: Processing {len(validated_products)} validated products")
+        if self.verbose:
+            print(f"\n🔄 PRODUCT MERGING: Processing {len(validated_products)} validated products")
         
         merged_products = {}
         update_stats = {
@@ -135,9 +185,10 @@ class DuplicateHandler:
                 # Add to cache
                 self._add_validated_to_cache(barcode, product_data, collection_timestamp)
         
-        print(f"   → Products merged: {update_stats['products_merged']}")
-        print(f"   → Products updated: {update_stats['products_updated']}")
-        print(f"   → New products cached: {update_stats['new_products_cached']}")
+        if self.verbose:
+            print(f"   → Products merged: {update_stats['products_merged']}")
+            print(f"   → Products updated: {update_stats['products_updated']}")
+            print(f"   → New products cached: {update_stats['new_products_cached']}")
         
         return {
             "merged_products": merged_products,
@@ -148,35 +199,34 @@ class DuplicateHandler:
         """
         Clean expired products from cache
         """
-        print(f"\n🧹 CACHE CLEANUP: Removing products older than {max_age_days} days")
+        if self.verbose:
+            print(f"\n🧹 CACHE CLEANUP: Removing products older than {max_age_days} days")
         
-        cutoff_date = datetime.now() - timedelta(days=max_age_days)
+        cutoff_epoch = (datetime.now() - timedelta(days=max_age_days) - _EPOCH).total_seconds()
         
+        # Pop only heap records older than the cutoff, re-checking each against the cache
         expired_products = []
-        for barcode, cached_data in self.products_cache.items():
-            last_seen = cached_data.get("last_collection_timestamp")
-            if last_seen:
-                try:
-                    last_seen_date = datetime.fromisoformat(last_seen.replace('Z', '+00:00'))
-                    if last_seen_date < cutoff_date:
-                        expired_products.append(barcode)
-                except ValueError:
-                    # Invalid date format, consider expired
-                    expired_products.append(barcode)
-        
-        # Remove expired products
-        for barcode in expired_products:
-            del self.products_cache[barcode]
+        expiry_heap = self._expiry_heap
+        while expiry_heap and expiry_heap[0][0] < cutoff_epoch:
+            _, barcode = heapq.heappop(expiry_heap)
+            cached_data = self.products_cache.get(barcode)
+            
+            # Stale record: product already removed or re-added without timestamp
+            if cached_data is None or not cached_data.get("last_collection_timestamp"):
+                continue
+            
+            last_seen_epoch = self._get_last_collection_epoch(cached_data)
+            # Invalid date format, consider expired
+            if last_seen_epoch is None or last_seen_epoch < cutoff_epoch:
+                del self.products_cache[barcode]
+                self._validated_barcodes.discard(barcode)
+                expired_products.append(barcode)
         
         # Clean collection history
         expired_collections = []
         for collection_id, collection_data in self.collection_history.items():
-            collection_date_str = collection_data.get("timestamp", "")
-            try:
-                collection_date = datetime.fromisoformat(collection_date_str.replace('Z', '+00:00'))
-                if collection_date < cutoff_date:
-                    expired_collections.append(collection_id)
-            except ValueError:
+            collection_epoch = _timestamp_to_epoch(collection_data.get("timestamp", ""))
+            if collection_epoch is None or collection_epoch < cutoff_epoch:
                 expired_collections.append(collection_id)
         
         for collection_id in expired_collections:
@@ -193,13 +243,14 @@ class DuplicateHandler:
             "remaining_collections": len(self.collection_history)
         }
         
-        print(f"   → Expired products removed: {cleanup_stats['expired_products_removed']}")
-        print(f"   → Remaining cached products: {cleanup_stats['remaining_products']}")
+        if self.verbose:
+            print(f"   → Expired products removed: {cleanup_stats['expired_products_removed']}")
+            print(f"   → Remaining cached products: {cleanup_stats['remaining_products']}")
         
         return cleanup_stats
 
     def _check_duplicate(self, barcode: str, product_data: Dict[str, Any], 
-                        collection_timestamp: str) -> Dict[str, Any]:
+                        collection_epoch: Optional[float]) -> Dict[str, Any]:
         """Check if product is duplicate of cached data"""
         cached_product = self.products_cache.get(barcode)
         
@@ -208,20 +259,19 @@ class DuplicateHandler:
         
         # Check exact duplicate (same barcode, recent collection)
         last_collection = cached_product.get("last_collection_timestamp", "")
-        try:
-            last_date = datetime.fromisoformat(last_collection.replace('Z', '+00:00'))
-            current_date = datetime.fromisoformat(collection_timestamp.replace('Z', '+00:00'))
+        last_epoch = self._get_last_collection_epoch(cached_product)
+        
+        if collection_epoch is not None and last_epoch is not None:
+            seconds_ago = collection_epoch - last_epoch
             
             # If collected within 24 hours, consider exact duplicate
-            if (current_date - last_date).total_seconds() < 86400:  # 24 hours
+            if seconds_ago < self.EXACT_DUPLICATE_WINDOW_SECONDS:
                 return {
                     "is_duplicate": True,
                     "duplicate_type": "exact",
                     "last_collection": last_collection,
-                    "hours_ago": (current_date - last_date).total_seconds() / 3600
+                    "hours_ago": seconds_ago / 3600
                 }
-        except ValueError:
-            pass
         
         # Check content duplicate (same content hash)
         current_content_hash = self._generate_content_hash(product_data)
@@ -235,12 +285,13 @@ class DuplicateHandler:
                 "content_hash": current_content_hash
             }
         
-        # Not a duplicate, but exists in cache (will be updated)
+        # Not a duplicate, but exists in cache (will be updated with this hash)
         return {
             "is_duplicate": False,
             "duplicate_type": None,
             "cache_exists": True,
-            "content_changed": True
+            "content_changed": True,
+            "content_hash": current_content_hash
         }
 
     def _generate_content_hash(self, product_data: Dict[str, Any]) -> str:
@@ -248,34 +299,80 @@ class DuplicateHandler:
         # Extract key fields for hashing
         raw_data = product_data.get("raw_discovery_data", {})
         
-        hash_fields = {
-            "product_name": raw_data.get("product_name", ""),
-            "product_name_fr": raw_data.get("product_name_fr", ""),
-            "brands": raw_data.get("brands", ""),
-            "product_quantity": raw_data.get("product_quantity", ""),
-            "quantity": raw_data.get("quantity", "")
-        }
+        hash_fields = (
+            raw_data.get("product_name", ""),
+            raw_data.get("product_name_fr", ""),
+            raw_data.get("brands", ""),
+            raw_data.get("product_quantity", ""),
+            raw_data.get("quantity", "")
+        )
+        
+        # Create deterministic hash (unit separator keeps fields unambiguous)
+        content_string = "\x1f".join(str(field) for field in hash_fields)
+        return hashlib.blake2b(content_string.encode(), digest_size=16).hexdigest()
+
+    def _get_last_collection_epoch(self, cached_product: Dict[str, Any]) -> Optional[float]:
+        """Return the cached last collection epoch, upgrading legacy entries on first touch"""
+        last_epoch = cached_product.get("last_collection_epoch")
         
-        # Create deterministic hash
-        content_string = json.dumps(hash_fields, sort_keys=True)
-        return hashlib.md5(content_string.encode()).hexdigest()
+        if last_epoch is None:
+            last_epoch = _timestamp_to_epoch(cached_product.get("last_collection_timestamp", ""))
+            if last_epoch is not None:
+                cached_product["last_collection_epoch"] = last_epoch
+        
+        return last_epoch
 
     def _add_to_cache(
             self, 
             barcode: str, 
             product_data: Dict[str, Any], 
-            collection_timestamp: str
+            collection_timestamp: str,
+            collection_epoch: Optional[float] = None,
+            content_hash: Optional[str] = None
         ):
-        """Add discovered product to cache"""
+        """Add discovered product to cache (reuses content_hash if already computed)"""
+        if collection_epoch is None:
+            collection_epoch = _timestamp_to_epoch(collection_timestamp)
+        if content_hash is None:
+            content_hash = self._generate_content_hash(product_data)
+        
         self.products_cache[barcode] = {
             "barcode": barcode,
             "first_collection_timestamp": collection_timestamp,
             "last_collection_timestamp": collection_timestamp,
+            "last_collection_epoch": collection_epoch,
             "collection_count": 1,
-            "content_hash": self._generate_content_hash(product_data),
+            "content_hash": content_hash,
             "discovery_data": product_data,
             "validation_status": "pending"
         }
+        self._validated_barcodes.discard(barcode)
+        self._push_expiry(barcode, self.products_cache[barcode])
+        
+        # Compact once stale records (re-added products) dominate the heap
+        if len(self._expiry_heap) > 2 * len(self.products_cache) + 1024:
+            self._rebuild_expiry_heap()
+
+    def _expiry_record(self, barcode: str, cached_data: Dict[str, Any]) -> Optional[Tuple[float, str]]:
+        """Build the expiry heap record of a cached product (invalid timestamps sort first)"""
+        if not cached_data.get("last_collection_timestamp"):
+            return None
+        
+        last_epoch = self._get_last_collection_epoch(cached_data)
+        return (last_epoch if last_epoch is not None else float("-inf"), barcode)
+
+    def _push_expiry(self, barcode: str, cached_data: Dict[str, Any]):
+        """Register a cached product in the expiry heap"""
+        record = self._expiry_record(barcode, cached_data)
+        if record is not None:
+            heapq.heappush(self._expiry_heap, record)
+
+    def _rebuild_expiry_heap(self):
+        """Rebuild the expiry heap from the products cache"""
+        records = [self._expiry_record(barcode, cached_data)
+                   for barcode, cached_data in self.products_cache.items()]
+        self._expiry_heap = [record for record in records if record is not None]
+        heapq.heapify(self._expiry_heap)
 
     def _add_validated_to_cache(
             self, 
@@ -294,6 +391,7 @@ class DuplicateHandler:
             "validated_data": product_data,
             "validation_count": existing.get("validation_count", 0) + 1
         }
+        self._validated_barcodes.add(barcode)
 
     def _merge_product_data(
             self, 
@@ -345,36 +443,58 @@ class DuplicateHandler:
             "validated_data": merged_product,
             "validation_count": self.products_cache.get(barcode, {}).get("validation_count", 0) + 1
         }
+        self._validated_barcodes.add(barcode)
 
     def _load_products_cache(self) -> Dict[str, Any]:
         """Load products cache from file"""
         if self.products_cache_file.exists():
             try:
-                with open(self.products_cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
+                products_cache = self._read_json(self.products_cache_file)
+            except (ValueError, IOError):
                 return {}
+            
+            # Share one string object per status value across all entries
+            for cached_data in products_cache.values():
+                status = cached_data.get("validation_status")
+                if isinstance(status, str):
+                    cached_data["validation_status"] = sys.intern(status)
+            
+            return products_cache
         return {}
 
     def _save_products_cache(self):
         """Save products cache to file"""
-        with open(self.products_cache_file, 'w', encoding='utf-8') as f:
-            json.dump(self.products_cache, f, indent=2, ensure_ascii=False, default=str)
+        self._write_json_atomic(self.products_cache_file, self.products_cache)
 
     def _load_collection_history(self) -> Dict[str, Any]:
         """Load collection history from file"""
         if self.collection_history_file.exists():
             try:
-                with open(self.collection_history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
+                return self._read_json(self.collection_history_file)
+            except (ValueError, IOError):
                 return {}
         return {}
 
     def _save_collection_history(self):
         """Save collection history to file"""
-        with open(self.collection_history_file, 'w', encoding='utf-8') as f:
-            json.dump(self.collection_history, f, indent=2, ensure_ascii=False, default=str)
+        self._write_json_atomic(self.collection_history_file, self.collection_history)
+
+    def _read_json(self, filepath: Path) -> Dict[str, Any]:
+        """Read a JSON cache file (orjson when available)"""
+        return loads_json(filepath.read_bytes())
+
+    def _write_json_atomic(self, filepath: Path, data: Dict[str, Any]):
+        """Write JSON to a temporary file then rename it, so readers never see a torn file"""
+        content = dumps_json_bytes(data)
+        
+        tmp_file = filepath.with_name(filepath.name + ".tmp")
+        try:
+            tmp_file.write_bytes(content)
+            os.replace(tmp_file, filepath)
+        except OSError:
+            # Don't leave a partial .tmp sibling behind
+            tmp_file.unlink(missing_ok=True)
+            raise
 
     def record_collection_run(self, collection_metadata: Dict[str, Any]) -> str:
         """Record a collection run in history"""
@@ -391,8 +511,7 @@ class DuplicateHandler:
     def get_cache_statistics(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics"""
         total_products = len(self.products_cache)
-        validated_products = len([p for p in self.products_cache.values() 
-                                if p.get("validation_status") == "validated"])
+        validated_products = len(self._validated_barcodes)
         
         return {
             "cache_statistics": {
@@ -418,6 +537,7 @@ class DuplicateHandler:
 
 
 # TESTING
+# Run as a module: PYTHONPATH=src python -m food_scanner.data.utils.duplicate_handler
 if __name__ == "__main__":
     print("🧪 TESTING DUPLICATE HANDLER")
     print("=" * 50)
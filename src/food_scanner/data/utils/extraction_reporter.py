@@ -3,12 +3,13 @@ src/food_scanner/data/utils/extraction_reporter.py
 EXTRACTION REPORTING: Generate JSON reports with timestamps for extraction analysis
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
 from collections import Counter, defaultdict
 
+from .json_codec import dumps_json_bytes
+
 
 class ExtractionReporter:
     """
@@ -55,46 +56,58 @@ class ExtractionReporter:
         Returns:
             Dict mapping report type to saved file path
         """
-        print(f"\n📊 GENERATING EXTRACTION REPORTS")
-        print(f"   → Timestamp: {self.timestamp}")
-        print(f"   → Processing {len(extracted_products)} extracted products")
-        print("-" * 60)
+        print(
+            f"\n📊 GENERATING EXTRACTION REPORTS\n"
+            f"   → Timestamp: {self.timestamp}\n"
+            f"   → Processing {len(extracted_products)} extracted products\n"
+            + "-" * 60
+        )
         
         saved_reports = {}
         
+        # Shared across reports: one generation time, production readiness counted once
+        generation_timestamp = datetime.now().isoformat()
+        production_ready_count = self._count_production_ready(extracted_products)
+        
         # 1. Missing CO2 report
-        missing_co2_report = self.generate_missing_co2_report(extracted_products)
+        missing_co2_report = self.generate_missing_co2_report(extracted_products, generation_timestamp)
         saved_reports["missing_co2"] = missing_co2_report
         
         # 2. Missing fields report  
-        missing_fields_report = self.generate_missing_fields_report(extracted_products)
+        missing_fields_report = self.generate_missing_fields_report(extracted_products, generation_timestamp)
         saved_reports["missing_fields"] = missing_fields_report
         
         # 3. Extraction quality report
         quality_report = self.generate_extraction_quality_report(
-            extracted_products, extraction_stats, pipeline_stats
+            extracted_products, extraction_stats, pipeline_stats, generation_timestamp
         )
         saved_reports["extraction_quality"] = quality_report
         
         # 4. Comprehensive quality summary (JSON)
         summary_report = self.generate_quality_summary_report(
-            extracted_products, extraction_stats, pipeline_stats, saved_reports
+            extracted_products, extraction_stats, pipeline_stats, saved_reports,
+            production_ready_count
         )
         saved_reports["quality_summary"] = summary_report
         
         # 5. Markdown quality report
         markdown_report = self.generate_markdown_quality_report(
-            extracted_products, extraction_stats, pipeline_stats
+            extracted_products, extraction_stats, pipeline_stats, production_ready_count,
+            generation_timestamp
         )
         saved_reports["quality_summary_md"] = markdown_report
         
-        print(f"\n✅ All extraction reports generated:")
-        for report_type, file_path in saved_reports.items():
-            print(f"   → {report_type}: {file_path.name}")
+        lines = [f"\n✅ All extraction reports generated:"]
+        lines.extend(f"   → {report_type}: {file_path.name}" for report_type, file_path in saved_reports.items())
+        print("\n".join(lines))
         
         return saved_reports
     
-    def generate_missing_co2_report(self, extracted_products: Dict[str, Any]) -> Path:
+    def generate_missing_co2_report(
+        self,
+        extracted_products: Dict[str, Any],
+        generation_timestamp: str = None
+    ) -> Path:
         """
         Generate detailed report of products missing CO2 data
         Format: missing_co2_YYYYMMDD_HHMMSS.json
@@ -156,7 +169,7 @@ class ExtractionReporter:
         missing_co2_report = {
             "report_info": {
                 "report_type": "missing_co2_analysis",
-                "generation_timestamp": datetime.now().isoformat(),
+                "generation_timestamp": generation_timestamp or datetime.now().isoformat(),
                 "extraction_timestamp": self.timestamp,
                 "total_products_analyzed": len(extracted_products),
                 "products_missing_co2": len(missing_co2_products),
@@ -183,13 +196,16 @@ class ExtractionReporter:
         filename = f"missing_co2_{self.timestamp}.json"
         filepath = self.reports_dirs["missing_co2"] / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(missing_co2_report, f, indent=2, ensure_ascii=False, default=str)
+        self._write_json_report(filepath, missing_co2_report)
         
         print(f"      ✅ Missing CO2 report: {len(missing_co2_products)} products missing CO2")
         return filepath
     
-    def generate_missing_fields_report(self, extracted_products: Dict[str, Any]) -> Path:
+    def generate_missing_fields_report(
+        self,
+        extracted_products: Dict[str, Any],
+        generation_timestamp: str = None
+    ) -> Path:
         """
         Generate report of products with missing critical fields
         Format: missing_fields_YYYYMMDD_HHMMSS.json
@@ -253,7 +269,7 @@ class ExtractionReporter:
         missing_fields_report = {
             "report_info": {
                 "report_type": "missing_fields_analysis",
-                "generation_timestamp": datetime.now().isoformat(),
+                "generation_timestamp": generation_timestamp or datetime.now().isoformat(),
                 "extraction_timestamp": self.timestamp,
                 "total_products_analyzed": len(extracted_products),
                 "products_with_missing_fields": len(products_with_missing_fields)
@@ -284,8 +300,7 @@ class ExtractionReporter:
         filename = f"missing_fields_{self.timestamp}.json"
         filepath = self.reports_dirs["missing_fields"] / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(missing_fields_report, f, indent=2, ensure_ascii=False, default=str)
+        self._write_json_report(filepath, missing_fields_report)
         
         print(f"      ✅ Missing fields report: {len(products_with_missing_fields)} products with missing fields")
         return filepath
@@ -294,7 +309,8 @@ class ExtractionReporter:
         self, 
         extracted_products: Dict[str, Any],
         extraction_stats: Dict[str, Any], 
-        pipeline_stats: Dict[str, Any]
+        pipeline_stats: Dict[str, Any],
+        generation_timestamp: str = None
     ) -> Path:
         """
         Generate comprehensive extraction quality metrics
@@ -378,7 +394,7 @@ class ExtractionReporter:
         quality_report = {
             "report_info": {
                 "report_type": "extraction_quality_analysis",
-                "generation_timestamp": datetime.now().isoformat(),
+                "generation_timestamp": generation_timestamp or datetime.now().isoformat(),
                 "extraction_timestamp": self.timestamp,
                 "analysis_scope": "field_extraction_performance"
             },
@@ -404,8 +420,7 @@ class ExtractionReporter:
         filename = f"extraction_quality_{self.timestamp}.json"
         filepath = self.reports_dirs["extraction_quality"] / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(quality_report, f, indent=2, ensure_ascii=False, default=str)
+        self._write_json_report(filepath, quality_report)
         
         overall_quality = quality_report["quality_summary"]["overall_extraction_quality"]
         print(f"      ✅ Extraction quality report: {overall_quality:.1f}% overall quality")
@@ -416,7 +431,8 @@ class ExtractionReporter:
         extracted_products: Dict[str, Any],
         extraction_stats: Dict[str, Any],
         pipeline_stats: Dict[str, Any],
-        generated_reports: Dict[str, Path]
+        generated_reports: Dict[str, Path],
+        production_ready_count: int = None
     ) -> Path:
         """
         Generate executive summary combining all quality metrics
@@ -429,23 +445,9 @@ class ExtractionReporter:
         successful_extractions = extraction_stats.get("successful_extractions", 0)
         field_counts = extraction_stats.get("field_success_counts", {})
         
-        # Calculate production readiness
-        critical_fields = ["barcode", "product_name", "brand_name", "co2_total"]
-        production_ready_count = 0
-        
-        for barcode, product_data in extracted_products.items():
-            extracted_fields = product_data.get("extracted_fields", {})
-            success_flags = extracted_fields.get("extraction_success", {})
-            
-            # Check if all critical fields are available
-            has_all_critical = all(success_flags.get(field, False) for field in critical_fields)
-            
-            # Check nutriscore (need at least one)
-            has_nutriscore = (success_flags.get("nutriscore_grade", False) or 
-                            success_flags.get("nutriscore_score", False))
-            
-            if has_all_critical and has_nutriscore:
-                production_ready_count += 1
+        # Calculate production readiness (unless generate_all_reports already did)
+        if production_ready_count is None:
+            production_ready_count = self._count_production_ready(extracted_products)
         
         production_ready_rate = (production_ready_count / total_products * 100) if total_products > 0 else 0
         
@@ -481,8 +483,7 @@ class ExtractionReporter:
         filename = f"quality_summary_{self.timestamp}.json"
         filepath = self.reports_dirs["quality_reports"] / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(executive_summary, f, indent=2, ensure_ascii=False, default=str)
+        self._write_json_report(filepath, executive_summary)
         
         print(f"      ✅ Quality summary: {production_ready_rate:.1f}% production ready")
         return filepath
@@ -498,7 +499,9 @@ class ExtractionReporter:
         self,
         extracted_products: Dict[str, Any],
         extraction_stats: Dict[str, Any],
-        pipeline_stats: Dict[str, Any]
+        pipeline_stats: Dict[str, Any],
+        production_ready_count: int = None,
+        generation_timestamp: str = None
     ) -> Path:
         """
         Generate comprehensive Markdown quality report with visual formatting
@@ -511,23 +514,9 @@ class ExtractionReporter:
         successful_extractions = extraction_stats.get("successful_extractions", 0)
         field_counts = extraction_stats.get("field_success_counts", {})
         
-        # Calculate production readiness
-        critical_fields = ["barcode", "product_name", "brand_name", "co2_total"]
-        production_ready_count = 0
-        
-        for barcode, product_data in extracted_products.items():
-            extracted_fields = product_data.get("extracted_fields", {})
-            success_flags = extracted_fields.get("extraction_success", {})
-            
-            # Check if all critical fields are available
-            has_all_critical = all(success_flags.get(field, False) for field in critical_fields)
-            
-            # Check nutriscore (need at least one)
-            has_nutriscore = (success_flags.get("nutriscore_grade", False) or 
-                            success_flags.get("nutriscore_score", False))
-            
-            if has_all_critical and has_nutriscore:
-                production_ready_count += 1
+        # Calculate production readiness (unless generate_all_reports already did)
+        if production_ready_count is None:
+            production_ready_count = self._count_production_ready(extracted_products)
         
         production_ready_rate = (production_ready_count / total_products * 100) if total_products > 0 else 0
         
@@ -546,19 +535,44 @@ class ExtractionReporter:
         # Build Markdown content
         markdown_content = self._build_markdown_report(
             overall_quality, quality_grade, production_ready_rate,
-            field_quality_data, recommendations, pipeline_stats
+            field_quality_data, recommendations, pipeline_stats,
+            generation_timestamp or datetime.now().isoformat()
         )
         
         # Save Markdown report
         filename = f"quality_summary_{self.timestamp}.md"
         filepath = self.reports_dirs["quality_reports"] / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        filepath.write_text(markdown_content, encoding='utf-8')
         
         print(f"      ✅ Markdown quality report: {overall_quality:.1f}/100 (Grade: {quality_grade})")
         return filepath
     
+    def _count_production_ready(self, extracted_products: Dict[str, Any]) -> int:
+        """Count products with every critical field and at least one nutriscore field"""
+        critical_fields = ["barcode", "product_name", "brand_name", "co2_total"]
+        production_ready_count = 0
+        
+        for product_data in extracted_products.values():
+            extracted_fields = product_data.get("extracted_fields", {})
+            success_flags = extracted_fields.get("extraction_success", {})
+            
+            # Check if all critical fields are available
+            has_all_critical = all(success_flags.get(field, False) for field in critical_fields)
+            
+            # Check nutriscore (need at least one)
+            has_nutriscore = (success_flags.get("nutriscore_grade", False) or 
+                            success_flags.get("nutriscore_score", False))
+            
+            if has_all_critical and has_nutriscore:
+                production_ready_count += 1
+        
+        return production_ready_count
+    
+    def _write_json_report(self, filepath: Path, report: Dict[str, Any]):
+        """Write a JSON report as indented UTF-8 in a single write (orjson when available)"""
+        filepath.write_bytes(dumps_json_bytes(report, indent=True))
+    
     def _would_be_rejected(self, extracted_fields: Dict[str, Any], success_flags: Dict[str, bool]) -> bool:
         """Determine if a product would be rejected based on business rules"""
         # Critical rejection criteria
@@ -767,14 +781,15 @@ class ExtractionReporter:
         production_ready_rate: float,
         field_quality_data: List[Dict[str, Any]],
         recommendations: List[Dict[str, str]],
-        pipeline_stats: Dict[str, Any]
+        pipeline_stats: Dict[str, Any],
+        generation_timestamp: str
     ) -> str:
         """Build the complete Markdown report content"""
         
         # Header
-        content = f"""# Data Quality Analysis Report
+        parts = [f"""# Data Quality Analysis Report
 
-**Analysis Date:** {datetime.now().isoformat()}  
+**Analysis Date:** {generation_timestamp}  
 **Overall Quality Score:** {overall_quality:.2f}/100 (Grade: {quality_grade})
 
 ## 📊 Dataset Overview
@@ -788,34 +803,36 @@ class ExtractionReporter:
 
 | Field | Presence Rate | Quality Score | Issues |
 |-------|---------------|---------------|--------|
-"""
+"""]
         
         # Field quality table
-        for field_data in field_quality_data:
-            content += f"| {field_data['field']} | {field_data['presence_rate']:.1f}% | {field_data['quality_score']:.1f} | {field_data['issues']} |\n"
+        parts.extend(
+            f"| {field_data['field']} | {field_data['presence_rate']:.1f}% | {field_data['quality_score']:.1f} | {field_data['issues']} |\n"
+            for field_data in field_quality_data
+        )
         
         # Recommendations section
-        content += "\n## ⚠️ Top Recommendations\n\n"
+        parts.append("\n## ⚠️ Top Recommendations\n\n")
         
         for i, rec in enumerate(recommendations, 1):
             priority_emoji = "🔴" if rec["priority"] == "HIGH" else "🟡" if rec["priority"] == "MEDIUM" else "🟢"
-            content += f"### {i}. {rec['title']} ({rec['priority']} Priority)\n\n"
-            content += f"**Issue:** {rec['issue']}  \n"
-            content += f"**Recommendation:** {rec['recommendation']}  \n"
-            content += f"**Implementation:** {rec['implementation']}\n\n"
+            parts.append(f"### {i}. {rec['title']} ({rec['priority']} Priority)\n\n")
+            parts.append(f"**Issue:** {rec['issue']}  \n")
+            parts.append(f"**Recommendation:** {rec['recommendation']}  \n")
+            parts.append(f"**Implementation:** {rec['implementation']}\n\n")
         
         # Quality metrics summary
-        content += "## 📈 Quality Metrics Summary\n\n"
-        content += f"- **Completeness:** {production_ready_rate:.1f}% ({self._get_completeness_grade(production_ready_rate)})\n"
-        content += f"- **Field Quality:** {overall_quality:.1f}%\n"
-        content += f"- **Consistency:** {overall_quality:.2f}% ({self._get_consistency_grade(overall_quality)})\n"
-        content += f"- **Accuracy:** {overall_quality:.2f}% ({self._get_accuracy_grade(overall_quality)})\n"
-        content += f"- **Rejection Rate:** {100 - production_ready_rate:.1f}%\n"
+        parts.append("## 📈 Quality Metrics Summary\n\n")
+        parts.append(f"- **Completeness:** {production_ready_rate:.1f}% ({self._get_completeness_grade(production_ready_rate)})\n")
+        parts.append(f"- **Field Quality:** {overall_quality:.1f}%\n")
+        parts.append(f"- **Consistency:** {overall_quality:.2f}% ({self._get_consistency_grade(overall_quality)})\n")
+        parts.append(f"- **Accuracy:** {overall_quality:.2f}% ({self._get_accuracy_grade(overall_quality)})\n")
+        parts.append(f"- **Rejection Rate:** {100 - production_ready_rate:.1f}%\n")
         
         # Footer
-        content += "\n---\n*Generated by ExtractionReporter v1.0*"
+        parts.append("\n---\n*Generated by ExtractionReporter v1.0*")
         
-        return content
+        return "".join(parts)
     
     def _get_completeness_grade(self, rate: float) -> str:
         """Get completeness grade"""
@@ -879,6 +896,7 @@ def integrate_with_extractor():
     return example_integration
 
 
+# Run as a module: PYTHONPATH=src python -m food_scanner.data.utils.extraction_reporter
 if __name__ == "__main__":
     print("🧪 TESTING EXTRACTION REPORTER")
     print("=" * 50)
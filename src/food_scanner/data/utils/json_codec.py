@@ -0,0 +1,58 @@
+"""
+src/food_scanner/data/utils/json_codec.py
+JSON ENCODING: Shared orjson/stdlib encoding rules for cache files and reports
+"""
+
+import json
+import math
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    # Fallback to stdlib json when orjson is not installed
+    orjson = None
+
+
+def _replace_non_finite(value: Any) -> Any:
+    """Replace NaN/Infinity floats with None, recursing into dicts, lists and tuples"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_non_finite(item) for item in value]
+    return value
+
+
+def dumps_json_bytes(data: Any, indent: bool = False) -> bytes:
+    """
+    Encode data as UTF-8 JSON (orjson when available)
+    
+    Both encoders write unknown types and datetimes via str() and NaN/Infinity
+    as null, compact by default or with a 2-space indent.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=str, option=option)
+    
+    if indent:
+        format_options = {"indent": 2}
+    else:
+        format_options = {"separators": (',', ':')}
+    
+    try:
+        text = json.dumps(data, ensure_ascii=False, default=str, allow_nan=False, **format_options)
+    except ValueError:
+        # Non-finite floats are rare: only pay for the rewrite when the fast path refuses
+        text = json.dumps(_replace_non_finite(data), ensure_ascii=False, default=str, **format_options)
+    return text.encode('utf-8')
+
+
+def loads_json(content: bytes) -> Any:
+    """Decode JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)